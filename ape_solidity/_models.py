@@ -336,7 +336,7 @@ class SourceTree(ApeSolidityModel):
         imports_by_source_id = {k[1]: v for k, v in statements.items()}
         keys = sorted(imports_by_source_id.keys())
         return {
-            k: sorted(list({i.source_id for i in imports_by_source_id[k] if i.source_id}))
+            k: sorted({i.source_id for i in imports_by_source_id[k] if i.source_id})
             for k in keys
         }
 
@@ -110,7 +110,7 @@ def add_commit_hash(version: Union[str, Version]) -> Version:
 
 
 def get_versions_can_use(pragma_spec: "SpecifierSet", options: Iterable[Version]) -> list[Version]:
-    return sorted(list(pragma_spec.filter(options)), reverse=True)
+    return sorted(pragma_spec.filter(options), reverse=True)
 
 
 def select_version(pragma_spec: "SpecifierSet", options: Iterable[Version]) -> Optional[Version]:
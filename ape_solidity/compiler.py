@@ -312,13 +312,13 @@ class SolidityCompiler(CompilerAPI):
         **kwargs,
     ):
         pm = project or self.local_project
-        files_by_solc_version = self.get_version_map_from_imports(
-            contract_filepaths, import_tree, project=pm
-        )
+        paths = list(contract_filepaths)  # Handle if given generator=
+        files_by_solc_version = self.get_version_map_from_imports(paths, import_tree, project=pm)
         return self._get_settings_from_version_map(
             files_by_solc_version,
             import_tree=import_tree,
             project=pm,
+            contract_filepaths=paths,
             **kwargs,
         )
 
@@ -327,6 +327,7 @@ class SolidityCompiler(CompilerAPI):
         version_map: dict[Version, set[Path]],
         import_tree: SourceTree,
         project: Optional[ProjectManager] = None,
+        contract_filepaths: Optional[Iterable[Path]] = None,
         **kwargs,
     ) -> dict[Version, dict]:
         pm = project or self.local_project
@@ -334,14 +335,28 @@ class SolidityCompiler(CompilerAPI):
             return {}
 
         config = self.get_config(project=pm)
+
+        # When given the input files, sources only present because they are imported
+        # only need their AST, which saves solc from generating their bytecode.
+        input_source_ids = (
+            None
+            if contract_filepaths is None
+            else {f"{get_relative_path(p.absolute(), pm.path)}" for p in contract_filepaths}
+        )
+
         settings: dict = {}
         for solc_version, sources in version_map.items():
+            output_selection: dict[str, dict] = {}
+            for path in sorted(sources):
+                source_id = f"{get_relative_path(path, pm.path)}"
+                if input_source_ids is None or source_id in input_source_ids:
+                    output_selection[source_id] = {"*": OUTPUT_SELECTION, "": ["ast"]}
+                else:
+                    output_selection[source_id] = {"": ["ast"]}
+
             version_settings: dict[str, Union[Any, list[Any]]] = {
                 "optimizer": {"enabled": config.optimize, "runs": config.optimization_runs},
-                "outputSelection": {
-                    str(get_relative_path(p, pm.path)): {"*": OUTPUT_SELECTION, "": ["ast"]}
-                    for p in sorted(sources)
-                },
+                "outputSelection": output_selection,
                 **kwargs,
             }
             if remappings_used := import_tree.get_remappings_used(sources):
@@ -375,7 +390,11 @@ class SolidityCompiler(CompilerAPI):
         import_tree = SourceTree.from_source_files(paths, pm)
         version_map = self.get_version_map_from_imports(paths, import_tree, project=pm)
         return self.get_standard_input_json_from_version_map(
-            version_map, project=pm, import_tree=import_tree, **overrides
+            version_map,
+            project=pm,
+            import_tree=import_tree,
+            contract_filepaths=paths,
+            **overrides,
         )
 
     def get_standard_input_json_from_version_map(
@@ -383,11 +402,16 @@ class SolidityCompiler(CompilerAPI):
         version_map: dict[Version, set[Path]],
         import_tree: SourceTree,
         project: Optional[ProjectManager] = None,
+        contract_filepaths: Optional[Iterable[Path]] = None,
         **overrides,
     ):
         pm = project or self.local_project
         settings = self._get_settings_from_version_map(
-            version_map, import_tree, project=pm, **overrides
+            version_map,
+            import_tree,
+            project=pm,
+            contract_filepaths=contract_filepaths,
+            **overrides,
         )
         return self.get_standard_input_json_from_settings(settings, version_map, project=pm)
 
@@ -483,15 +507,13 @@ class SolidityCompiler(CompilerAPI):
             version_map,
             import_tree,
             project=pm,
+            contract_filepaths=paths,
             **(settings or {}),
         )
         contract_versions: dict[str, Version] = {}
         contract_types: list[ContractType] = []
         for solc_version, input_json in input_jsons.items():
-            keys = (
-                "\n\t".join(sorted([x for x in input_json.get("sources", {}).keys()]))
-                or "No input."
-            )
+            keys = "\n\t".join(sorted(input_json.get("sources", {}))) or "No input."
             log_str = f"Compiling using Solidity compiler '{solc_version}'.\nInput:\n\t{keys}"
             logger.info(log_str)
             cleaned_version = Version(solc_version.base_version)
@@ -529,6 +551,10 @@ class SolidityCompiler(CompilerAPI):
                         # Only return ContractTypes explicitly asked for.
                         continue
 
+                    elif "evm" not in ct_data:
+                        # Imported-only source (only the AST was requested).
+                        continue
+
                     evm_data = ct_data["evm"]
 
                     # NOTE: This sounds backwards, but it isn't...
@@ -913,7 +939,7 @@ class SolidityCompiler(CompilerAPI):
         path = Path(path)
         source_id = f"{get_relative_path(path, pm.path)}" if path.is_absolute() else f"{path}"
         handled.add(source_id)
-        relevant_imports = sorted(list(import_tree[path]), key=lambda x: x.raw_value)
+        relevant_imports = sorted(import_tree[path], key=lambda x: x.raw_value)
 
         final_source = ""
         for import_metadata in relevant_imports:
@@ -0,0 +1,41 @@
+// SPDX-License-Identifier: MIT
+
+pragma solidity >=0.8.0;
+
+contract StackTooDeep {
+    // This contract tests the scenario when we have a contract with
+    // too many local variables and the stack is too deep.
+    // The compiler will throw an error when trying to compile this contract.
+    // To get around the error, we can compile the contract with the
+    // --via-ir flag
+
+    function foo(
+        uint256 a,
+        uint256 b,
+        uint256 c,
+        uint256 d,
+        uint256 e,
+        uint256 f,
+        uint256 g,
+        uint256 h,
+        uint256 i,
+        uint256 j,
+        uint256 k,
+        uint256 l,
+        uint256 m,
+        uint256 n,
+        uint256 o,
+        uint256 p
+    ) public pure returns (uint256) {
+
+        uint256 sum = 0;
+
+        for (uint256 index = 0; index < 16; index++) {
+            uint256 innerSum = a + b + c + d + e + f + g + h + i + j + k + l + m + n + o + p;
+            sum += innerSum;
+        }
+
+        return (sum);
+    }
+
+}
@@ -1,31 +1,56 @@
+import os
 import shutil
-from contextlib import contextmanager
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from tempfile import mkdtemp
+from typing import Optional
 from unittest import mock
 
 import ape
 import pytest
 import solcx
-from ape.utils.os import create_tempdir
 from click.testing import CliRunner
+from requests.exceptions import RequestException
+from solcx.exceptions import DownloadError, SolcInstallationError
 
 from ape_solidity._utils import Extension
 
+# Versions the test contracts' pragmas resolve to (besides the latest version,
+# which open-ended pragmas such as `>=0.8.17` use). These get installed up-front,
+# so the installed set is fixed before pytest-xdist workers (which share it) start.
+SOLC_VERSIONS = ("0.4.26", "0.5.16", "0.8.12", "0.8.14")
 
-@contextmanager
-def _tmp_solcx_path(monkeypatch):
-    solcx_install_path = mkdtemp()
+# Set to keep the temporary data folder in memory (tmpfs), e.g. on Linux CI.
+TMPFS_ENV_VAR = "APE_SOLIDITY_TEST_TMPFS"
+SHM_PATH = "/dev/shm"
 
-    monkeypatch.setenv(
-        solcx.install.SOLCX_BINARY_PATH_VARIABLE,
-        solcx_install_path,
-    )
 
-    yield solcx_install_path
+def pytest_configure(config):
+    if hasattr(config, "workerinput") or config.option.collectonly:
+        # Only the main process (or the pytest-xdist controller) installs,
+        # and only when running tests.
+        return
 
-    if Path(solcx_install_path).is_dir():
-        shutil.rmtree(solcx_install_path, ignore_errors=True)
+    install_errors = (RequestException, DownloadError, SolcInstallationError)
+    versions = list(SOLC_VERSIONS)
+    try:
+        versions.append(f"{max(solcx.get_installable_solc_versions())}")
+    except install_errors:
+        # Offline; tests install what they need as they go.
+        return
+
+    installed = {f"{v}" for v in solcx.get_installed_solc_versions()}
+    if not (missing := [v for v in versions if v not in installed]):
+        return
+
+    # Download concurrently, so a cold start only waits on the slowest one.
+    # NOTE: solcx locks installs per-version.
+    with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+        try:
+            list(executor.map(solcx.install_solc, missing))
+        except install_errors:
+            # Failed; tests install what they need as they go.
+            pass
 
 
 @pytest.fixture
@@ -41,12 +66,14 @@ def fake_no_installs(mocker):
 
 
 @pytest.fixture
-def temp_solcx_path(monkeypatch):
+def temp_solcx_path(monkeypatch, tmp_path):
     """
     Creates a new, temporary installation path for solcx for a given test.
     """
-    with _tmp_solcx_path(monkeypatch) as path:
-        yield path
+    path = tmp_path / "solcx"
+    path.mkdir()
+    monkeypatch.setenv(solcx.install.SOLCX_BINARY_PATH_VARIABLE, f"{path}")
+    return path
 
 
 @pytest.fixture(scope="session")
@@ -58,15 +85,16 @@ def project(config):
     for path in (
         root,
         root / "BrownieProject",
-        root / "BrownieStyleDependency",
         root / "Dependency",
         root / "DependencyOfDependency",
+        root / "NonCompilingDependency",
         root / "ProjectWithinProject",
         root / "VersionSpecifiedInConfig",
+        root / "ViaIRProject",
     ):
         for cache in (path / ".build", path / "contracts" / ".cache"):
-            if cache.is_dir():
-                shutil.rmtree(cache)
+            # NOTE: Other pytest-xdist workers may be deleting the same folder.
+            shutil.rmtree(cache, ignore_errors=True)
 
     root_project = ape.Project(root)
     with root_project.isolate_in_tempdir() as tmp_project:
@@ -84,24 +112,40 @@ def config():
 
     # Ensure we don't persist any .ape data.
     real_data_folder = cfg.DATA_FOLDER
-    with create_tempdir() as path:
+    packages = real_data_folder / "packages"
+    packages.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=_get_temp_data_root(packages)) as temp_dir:
+        path = Path(temp_dir).resolve()
         cfg.DATA_FOLDER = path
 
         # Copy in existing packages to save test time
         # when running locally.
-        packages = real_data_folder / "packages"
-        packages.mkdir(parents=True, exist_ok=True)
         shutil.copytree(packages, path / "packages", dirs_exist_ok=True)
 
         yield cfg
 
 
-@pytest.fixture
+def _get_temp_data_root(packages: Path) -> Optional[str]:
+    # Opt-in: use tmpfs (RAM) for the packages and caches written during the tests.
+    # Otherwise (or when tmpfs lacks room), use the system's default temp directory.
+    if not os.environ.get(TMPFS_ENV_VAR) or not os.access(SHM_PATH, os.W_OK):
+        return None
+
+    # NOTE: Each pytest-xdist worker copies the packages folder.
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1))
+    packages_size = sum(p.stat().st_size for p in packages.rglob("*") if p.is_file())
+    if shutil.disk_usage(SHM_PATH).free <= packages_size * workers:
+        return None
+
+    return SHM_PATH
+
+
+@pytest.fixture(scope="session")
 def compiler_manager():
     return ape.compilers
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def compiler(compiler_manager):
     return compiler_manager.solidity
 
@@ -148,6 +192,7 @@ def connection():
         yield provider
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def cli_runner():
+    # NOTE: CliRunner holds no state between invocations, so one is shared.
     return CliRunner()
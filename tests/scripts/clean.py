@@ -13,8 +13,10 @@ def clean():
         project_path / "BrownieProject",
         project_path / "Dependency",
         project_path / "DependencyOfDependency",
+        project_path / "NonCompilingDependency",
         project_path / "ProjectWithinProject",
         project_path / "VersionSpecifiedInConfig",
+        project_path / "ViaIRProject",
     ):
         for cache in (path / ".build", path / "contracts" / ".cache"):
             if cache.is_dir():
@@ -1,8 +1,11 @@
+import re
+from collections import Counter
 from pathlib import Path
 
 import pytest
 import solcx
 from ape import Project, reverts
+from ape.contracts import ContractContainer
 from ape.exceptions import CompilerError
 from ape.utils import get_full_extension
 from ethpm_types import ContractType
@@ -11,7 +14,85 @@ from packaging.version import Version
 from ape_solidity.exceptions import IndexOutOfBoundsError
 
 EXPECTED_NON_SOLIDITY_ERR_MSG = "Unable to compile 'RandomVyperFile.vy' using Solidity compiler."
-raises_because_not_sol = pytest.raises(CompilerError, match=EXPECTED_NON_SOLIDITY_ERR_MSG)
+NON_SOLIDITY_ERR_PATTERN = re.compile(re.escape(EXPECTED_NON_SOLIDITY_ERR_MSG))
+
+
+def raises_because_not_sol():
+    # NOTE: A new context each time; `pytest.raises()` contexts are not meant to be re-used.
+    return pytest.raises(CompilerError, match=NON_SOLIDITY_ERR_PATTERN)
+
+
+# Remappings used by `contracts/Imports.sol`. NOTE: These should be sorted!
+EXPECTED_IMPORTS_REMAPPING = [
+    "@browniedependency=contracts/.cache/browniedependency/local",
+    "@dependency=contracts/.cache/dependency/local",
+    "@dependencyofdependency=contracts/.cache/dependencyofdependency/local",
+    # This remapping below was auto-corrected because imports were excluding contracts/ suffix.
+    "@noncompilingdependency=contracts/.cache/noncompilingdependency/local/contracts",
+    "@safe=contracts/.cache/safe/1.3.0",
+]
+EXPECTED_FLATTENED_SOURCE = (
+    Path(__file__).parent / "data" / "ImportingLessConstrainedVersionFlat.sol"
+).read_text(encoding="utf8")
+EXPECTED_OUTPUT_SELECTION = {
+    "*": [
+        "abi",
+        "bin-runtime",
+        "devdoc",
+        "userdoc",
+        "evm.bytecode.object",
+        "evm.bytecode.sourceMap",
+        "evm.deployedBytecode.object",
+    ],
+    "": ["ast"],
+}
+
+
+def _get_solidity_source_paths(project) -> list[Path]:
+    return [x for x in project.sources.paths if x.suffix == ".sol"]
+
+
+def _get_duplicates(items) -> list:
+    return [k for k, v in Counter(items).items() if v > 1]
+
+
+@pytest.fixture(scope="module")
+def solidity_source_paths(project):
+    """
+    All the ``.sol`` sources in the project, collected once.
+    """
+    return _get_solidity_source_paths(project)
+
+
+@pytest.fixture(scope="module")
+def imports_contract_types(project, compiler):
+    """
+    ``contracts/Imports.sol`` compiled once and shared by the tests
+    asserting on its output.
+    """
+    path = project.sources.lookup("contracts/Imports.sol")
+    return [c for c in compiler.compile((path,), project=project)]
+
+
+@pytest.fixture(scope="module")
+def multiple_definitions_contract_types(project, compiler):
+    """
+    ``contracts/MultipleDefinitions.sol`` compiled on its own once.
+    NOTE: Not batched with other sources, as that changes its source-map.
+    """
+    path = project.sources.lookup("contracts/MultipleDefinitions.sol")
+    return [c for c in compiler.compile((path,), project=project)]
+
+
+@pytest.fixture(scope="module")
+def contract_containers(project, compiler):
+    """
+    The contracts deployed by the error-enrichment tests,
+    compiled together once.
+    """
+    source_ids = ("contracts/HasError.sol", "contracts/BuiltinErrorChecker.sol")
+    paths = [project.sources.lookup(x) for x in source_ids]
+    return {ct.name: ContractContainer(ct) for ct in compiler.compile(paths, project=project)}
 
 
 def test_get_config(project, compiler):
@@ -81,7 +162,13 @@ def test_get_imports(project, compiler):
     )
     actual = compiler.get_imports((path,), project=project)
     assert source_id in actual
-    assert all(e in actual[source_id] for e in expected)
+    assert isinstance(actual[source_id], list)
+    missing = set(expected) - set(actual[source_id])
+    assert not missing, f"{', '.join(missing)} NOT found in {', '.join(actual[source_id])}"
+
+    # Imports are only listed once.
+    duplicates = _get_duplicates(actual[source_id])
+    assert not duplicates, f"Duplicates: {duplicates}"
 
 
 def test_get_imports_indirect(project, compiler):
@@ -102,9 +189,10 @@ def test_get_imports_indirect(project, compiler):
     )
     actual = compiler.get_imports((path,), project=project)
     assert source_id in actual
-    actual_str = ", ".join(list(actual[source_id]))
-    for ex in expected:
-        assert ex in actual[source_id], f"{ex} WAS NOT found in {actual_str}"
+    duplicates = _get_duplicates(actual[source_id])
+    assert not duplicates, f"Duplicates: {duplicates}"
+    missing = set(expected) - set(actual[source_id])
+    assert not missing, f"{', '.join(missing)} NOT found in {', '.join(actual[source_id])}"
 
 
 def test_get_imports_complex(project, compiler):
@@ -174,12 +262,12 @@ def test_get_imports_dependencies(project, compiler):
 def test_get_imports_vyper_file(project, compiler):
     path = Path(__file__).parent / "contracts" / "RandomVyperFile.vy"
     assert path.is_file(), f"Setup failed - file not found {path}"
-    with raises_because_not_sol:
+    with raises_because_not_sol():
         compiler.get_imports((path,))
 
 
-def test_get_imports_full_project(project, compiler):
-    paths = [x for x in project.sources.paths if x.suffix == ".sol"]
+def test_get_imports_full_project(project, compiler, solidity_source_paths):
+    paths = solidity_source_paths
     actual = compiler.get_imports(paths, project=project)
     assert len(actual) > 0
     # Prove that every import source also is present in the import map.
@@ -198,8 +286,9 @@ def test_get_version_map(project, compiler):
     expected_sources = ("SpecificVersionWithEqualSign",)
     assert expected_version in actual
 
-    actual_ids = [x.stem for x in actual[expected_version]]
-    assert all(e in actual_ids for e in expected_sources)
+    actual_ids = {x.stem for x in actual[expected_version]}
+    missing = set(expected_sources) - actual_ids
+    assert not missing, f"{', '.join(missing)} NOT found in {', '.join(actual_ids)}"
 
 
 def test_get_version_map_importing_more_constrained_version(project, compiler):
@@ -216,8 +305,9 @@ def test_get_version_map_importing_more_constrained_version(project, compiler):
     expected_sources = ("ImportSourceWithEqualSignVersion", "SpecificVersionWithEqualSign")
     assert expected_version in actual
 
-    actual_ids = [x.stem for x in actual[expected_version]]
-    assert all(e in actual_ids for e in expected_sources)
+    actual_ids = {x.stem for x in actual[expected_version]}
+    missing = set(expected_sources) - actual_ids
+    assert not missing, f"{', '.join(missing)} NOT found in {', '.join(actual_ids)}"
 
 
 def test_get_version_map_indirectly_importing_more_constrained_version(project, compiler):
@@ -238,8 +328,9 @@ def test_get_version_map_indirectly_importing_more_constrained_version(project,
     )
     assert expected_version in actual
 
-    actual_ids = [x.stem for x in actual[expected_version]]
-    assert all(e in actual_ids for e in expected_sources)
+    actual_ids = {x.stem for x in actual[expected_version]}
+    missing = set(expected_sources) - actual_ids
+    assert not missing, f"{', '.join(missing)} NOT found in {', '.join(actual_ids)}"
 
 
 def test_get_version_map_dependencies(project, compiler):
@@ -251,7 +342,7 @@ def test_get_version_map_dependencies(project, compiler):
     paths = [project.sources.lookup(x) for x in (source_id, older_example)]
     actual = compiler.get_version_map(paths, project=project)
 
-    fail_msg = f"versions: {', '.join([str(x) for x in actual])}"
+    fail_msg = f"versions: {', '.join(map(str, actual))}"
     actual_len = len(actual)
 
     # Expecting one old version for ImportOlderDependency and one version for Yearn stuff.
@@ -265,7 +356,7 @@ def test_get_version_map_dependencies(project, compiler):
             for src_id in src_ids:
                 if src_id in alt_map:
                     other_version = alt_map[src_id]
-                    versions_str = ", ".join([str(other_version), str(version)])
+                    versions_str = f"{other_version}, {version}"
                     pytest.fail(f"{src_id} in multiple version '{versions_str}'")
                 else:
                     alt_map[src_id] = version
@@ -276,7 +367,7 @@ def test_get_version_map_dependencies(project, compiler):
     elif actual_len < expected_len:
         pytest.fail(fail_msg)
 
-    versions = sorted(list(actual.keys()))
+    versions = sorted(actual)
     older = versions[0]  # Via ImportOlderDependency
     latest = versions[1]  # via UseYearn
 
@@ -326,7 +417,7 @@ def test_get_version_map_picks_most_constrained_version(project, compiler):
 def test_get_version_map_version_specified_in_config_file(compiler):
     path = Path(__file__).parent / "VersionSpecifiedInConfig"
     project = Project(path)
-    paths = [p for p in project.sources.paths if p.suffix == ".sol"]
+    paths = _get_solidity_source_paths(project)
     actual = compiler.get_version_map(paths, project=project)
     expected_version = Version("0.8.12+commit.f00d7308")
     assert len(actual) == 1
@@ -336,14 +427,14 @@ def test_get_version_map_version_specified_in_config_file(compiler):
 
 def test_get_version_map_raises_on_non_solidity_sources(project, compiler):
     path = project.contracts_folder / "RandomVyperFile.vy"
-    with raises_because_not_sol:
+    with raises_because_not_sol():
         compiler.get_version_map((path,), project=project)
 
 
-def test_get_version_map_full_project(project, compiler):
-    paths = [x for x in project.sources.paths if x.suffix == ".sol"]
+def test_get_version_map_full_project(project, compiler, solidity_source_paths):
+    paths = solidity_source_paths
     actual = compiler.get_version_map(paths, project=project)
-    latest = sorted(list(actual.keys()), reverse=True)[0]
+    latest = max(actual)
     v0812 = Version("0.8.12+commit.f00d7308")
     vold = Version("0.4.26+commit.4563c3fc")
     assert v0812 in actual
@@ -386,22 +477,13 @@ def test_get_compiler_settings(project, compiler):
     settings = actual[version]
     assert settings["optimizer"] == {"enabled": True, "runs": 190}
 
-    # NOTE: These should be sorted!
-    expected_remapping = [
-        "@browniedependency=contracts/.cache/browniedependency/local",
-        "@dependency=contracts/.cache/dependency/local",
-        "@dependencyofdependency=contracts/.cache/dependencyofdependency/local",
-        # This remapping below was auto-corrected because imports were excluding contracts/ suffix.
-        "@noncompilingdependency=contracts/.cache/noncompilingdependency/local/contracts",
-        "@safe=contracts/.cache/safe/1.3.0",
-    ]
-    assert settings["remappings"] == expected_remapping
+    assert settings["remappings"] == EXPECTED_IMPORTS_REMAPPING
 
     # Set in config.
     assert settings["evmVersion"] == "constantinople"
 
     # Should be all files (imports of imports etc.)
-    actual_files = sorted(list(settings["outputSelection"].keys()))
+    actual_files = sorted(settings["outputSelection"])
     expected_files = [
         "contracts/.cache/browniedependency/local/contracts/BrownieContract.sol",
         "contracts/.cache/dependency/local/contracts/Dependency.sol",
@@ -419,36 +501,40 @@ def test_get_compiler_settings(project, compiler):
     ]
     assert actual_files == expected_files
 
-    # Output request is the same for all.
-    expected_output_request = {
-        "*": [
-            "abi",
-            "bin-runtime",
-            "devdoc",
-            "userdoc",
-            "evm.bytecode.object",
-            "evm.bytecode.sourceMap",
-            "evm.deployedBytecode.object",
-        ],
-        "": ["ast"],
-    }
-    for output in settings["outputSelection"].values():
-        assert output == expected_output_request
+    # Only the requested source needs compiler output; imported sources only need the AST.
+    for source_id, output in settings["outputSelection"].items():
+        if source_id == "contracts/Imports.sol":
+            assert output == EXPECTED_OUTPUT_SELECTION
+        else:
+            assert output == {"": ["ast"]}, source_id
+
+
+def test_get_standard_input_json_matches_compiler_settings(project, compiler):
+    """
+    Show the exported standard JSON input requests the same output
+    as what gets compiled (only the AST for imported-only sources).
+    """
+    path = project.sources.lookup("contracts/Imports.sol")
+    input_jsons = compiler.get_standard_input_json((path,), project=project)
+    settings = compiler.get_compiler_settings((path,), project=project)
+    assert input_jsons.keys() == settings.keys()
+    for version, input_json in input_jsons.items():
+        output_selection = input_json["settings"]["outputSelection"]
+        assert output_selection == settings[version]["outputSelection"]
+        assert output_selection["contracts/Imports.sol"] == EXPECTED_OUTPUT_SELECTION
 
 
-def test_get_standard_input_json(project, compiler):
-    paths = [x for x in project.sources.paths if x.suffix == ".sol"]
+def test_get_standard_input_json(project, compiler, solidity_source_paths):
+    paths = solidity_source_paths
     actual = compiler.get_standard_input_json(paths, project=project)
     v0812 = Version("0.8.12+commit.f00d7308")
     v056 = Version("0.5.16+commit.9c3226ce")
     v0426 = Version("0.4.26+commit.4563c3fc")
-    latest = sorted(list(actual.keys()), reverse=True)[0]
+    latest = max(actual)
 
-    fail_msg = f"Versions: {', '.join([str(v) for v in actual])}"
-    assert v0812 in actual, fail_msg
-    assert v056 in actual, fail_msg
-    assert v0426 in actual, fail_msg
-    assert latest in actual, fail_msg
+    if missing := {v0812, v056, v0426, latest} - set(actual):
+        missing_str = ", ".join(f"{v}" for v in sorted(missing))
+        pytest.fail(f"Missing versions '{missing_str}'. Versions: {', '.join(map(str, actual))}")
 
     v0812_sources = list(actual[v0812]["sources"].keys())
     v056_sources = list(actual[v056]["sources"].keys())
@@ -468,9 +554,8 @@ def test_get_standard_input_json(project, compiler):
     assert "contracts/.cache/dependency/local/contracts/OlderDependency.sol" in v0426_sources
 
 
-def test_compile(project, compiler):
-    path = project.sources.lookup("contracts/Imports.sol")
-    actual = [c for c in compiler.compile((path,), project=project)]
+def test_compile(imports_contract_types):
+    actual = imports_contract_types
     # We only get back the contracts we requested, even if it had to compile
     # others (like imports) to get it to work.
     assert len(actual) == 1
@@ -482,17 +567,23 @@ def test_compile(project, compiler):
     assert len(actual[0].abi) > 0
 
 
+@pytest.mark.benchmark
 def test_compile_performance(benchmark, compiler, project):
     """
     See https://pytest-benchmark.readthedocs.io/en/latest/
     """
+    if benchmark.disabled:
+        # e.g. pytest-benchmark turns itself off when running with pytest-xdist.
+        pytest.skip("Benchmarking is disabled.")
+
     path = project.sources.lookup("contracts/MultipleDefinitions.sol")
     result = benchmark.pedantic(
         lambda *args, **kwargs: [x for x in compiler.compile(*args, **kwargs)],
         args=((path,),),
         kwargs={"project": project},
-        rounds=1,
+        rounds=5,
         warmup_rounds=1,
+        iterations=1,
     )
     assert len(result) > 0
 
@@ -503,14 +594,13 @@ def test_compile_performance(benchmark, compiler, project):
     assert benchmark.stats["median"] < threshold
 
 
-def test_compile_multiple_definitions_in_source(project, compiler):
+def test_compile_multiple_definitions_in_source(project, multiple_definitions_contract_types):
     """
     Show that if multiple contracts / interfaces are defined in a single
     source, that we get all of them when compiling.
     """
     source_id = "contracts/MultipleDefinitions.sol"
-    path = project.sources.lookup(source_id)
-    result = [c for c in compiler.compile((path,), project=project)]
+    result = multiple_definitions_contract_types
     assert len(result) == 2
     assert [r.name for r in result] == ["IMultipleDefinitions", "MultipleDefinitions"]
     assert all(r.source_id == source_id for r in result)
@@ -527,19 +617,18 @@ def test_compile_contract_with_different_name_than_file(project, compiler):
     assert actual[0].source_id == source_id
 
 
-def test_compile_only_returns_contract_types_for_inputs(project, compiler):
+def test_compile_only_returns_contract_types_for_inputs(imports_contract_types):
     """
     Test showing only the requested contract types get returned.
     """
-    path = project.sources.lookup("contracts/Imports.sol")
-    contract_types = [c for c in compiler.compile((path,), project=project)]
+    contract_types = imports_contract_types
     assert len(contract_types) == 1
     assert contract_types[0].name == "Imports"
 
 
 def test_compile_vyper_contract(project, compiler):
     path = project.contracts_folder / "RandomVyperFile.vy"
-    with raises_because_not_sol:
+    with raises_because_not_sol():
         _ = [c for c in compiler.compile((path,), project=project)]
 
 
@@ -548,76 +637,30 @@ def test_compile_just_a_struct(compiler, project):
     Before, you would get a nasty index error, even though this is valid Solidity.
     The fix involved using nicer access to "contracts" in the standard output JSON.
     """
+    # NOTE: Compiled alone, so the output has no "contracts" key.
     path = project.sources.lookup("contracts/JustAStruct.sol")
     contract_types = [c for c in compiler.compile((path,), project=project)]
     assert len(contract_types) == 0
 
 
-def test_compile_produces_source_map(project, compiler):
-    path = project.sources.lookup("contracts/MultipleDefinitions.sol")
-    result = [c for c in compiler.compile((path,), project=project)][-1]
+def test_compile_produces_source_map(multiple_definitions_contract_types):
+    result = multiple_definitions_contract_types[-1]
     assert result.sourcemap.root == "124:87:0:-:0;;;;;;;;;;;;;;;;;;;"
 
 
 def test_compile_via_ir(project, compiler):
-    path = project.contracts_folder / "StackTooDep.sol"
-    source_code = """
-// SPDX-License-Identifier: MIT
-
-pragma solidity >=0.8.0;
-
-contract StackTooDeep {
-    // This contract tests the scenario when we have a contract with
-    // too many local variables and the stack is too deep.
-    // The compiler will throw an error when trying to compile this contract.
-    // To get around the error, we can compile the contract with the
-    // --via-ir flag
-
-    function foo(
-        uint256 a,
-        uint256 b,
-        uint256 c,
-        uint256 d,
-        uint256 e,
-        uint256 f,
-        uint256 g,
-        uint256 h,
-        uint256 i,
-        uint256 j,
-        uint256 k,
-        uint256 l,
-        uint256 m,
-        uint256 n,
-        uint256 o,
-        uint256 p
-    ) public pure returns (uint256) {
-
-        uint256 sum = 0;
-
-        for (uint256 index = 0; index < 16; index++) {
-            uint256 innerSum = a + b + c + d + e + f + g + h + i + j + k + l + m + n + o + p;
-            sum += innerSum;
-        }
-
-        return (sum);
-    }
+    with Project(Path(__file__).parent / "ViaIRProject").isolate_in_tempdir() as via_ir_project:
+        path = via_ir_project.contracts_folder / "StackTooDeep.sol"
 
-}
-    """
+        # Without via-IR, the stack is too deep.
+        with pytest.raises(Exception, match="Stack too deep"):
+            compiler.compile_code(path.read_text(encoding="utf8"), project=project)
 
-    # write source code to file
-    path.write_text(source_code)
-
-    try:
-        [c for c in compiler.compile((path,), project=project)]
-    except Exception as e:
-        assert "Stack too deep" in str(e)
-
-    with project.temp_config(solidity={"via_ir": True}):
-        _ = [c for c in compiler.compile((path,), project=project)]
+        # `via_ir: true` is set in the project's config.
+        actual = [c for c in compiler.compile((path,), project=via_ir_project)]
 
-        # delete source code file
-        path.unlink()
+    assert len(actual) == 1
+    assert actual[0].name == "StackTooDeep"
 
 
 @pytest.mark.install
@@ -677,35 +720,33 @@ def test_add_library(project, account, compiler, connection):
     assert project.ContractUsingLibraryInSameSource
 
 
-def test_enrich_error_when_custom(compiler, project, owner, not_owner, connection):
-    path = project.sources.lookup("contracts/HasError.sol")
-    _ = [c for c in compiler.compile((path,), project=project)]
-
+def test_enrich_error_when_custom(contract_containers, owner, not_owner, connection):
     # Deploy so Ape know about contract type.
-    contract = owner.deploy(project.HasError, 1)
+    contract = owner.deploy(contract_containers["HasError"], 1)
     with pytest.raises(contract.Unauthorized) as err:
         contract.withdraw(sender=not_owner)
 
     assert err.value.inputs == {"addr": not_owner.address, "counter": 123}
 
 
-def test_enrich_error_when_custom_in_constructor(compiler, project, owner, not_owner, connection):
+def test_enrich_error_when_custom_in_constructor(contract_containers, not_owner, connection):
+    container = contract_containers["HasError"]
+
     # Deploy so Ape know about contract type.
-    with reverts(project.HasError.Unauthorized) as err:
-        not_owner.deploy(project.HasError, 0)
+    with reverts(container.Unauthorized) as err:
+        not_owner.deploy(container, 0)
 
     assert err.value.inputs == {"addr": not_owner.address, "counter": 123}
 
 
-def test_enrich_error_when_builtin(project, owner, connection):
-    contract = project.BuiltinErrorChecker.deploy(sender=owner)
+def test_enrich_error_when_builtin(contract_containers, owner, connection):
+    contract = contract_containers["BuiltinErrorChecker"].deploy(sender=owner)
     with pytest.raises(IndexOutOfBoundsError):
         contract.checkIndexOutOfBounds(sender=owner)
 
 
 def test_flatten(mocker, project, compiler):
     path = project.contracts_folder / "Imports.sol"
-    base_expected = Path(__file__).parent / "data"
 
     # NOTE: caplog for some reason is inconsistent and causes flakey tests.
     #  Thus, we are using our own "logger_spy".
@@ -725,11 +766,8 @@ def test_flatten(mocker, project, compiler):
 
     path = project.contracts_folder / "ImportingLessConstrainedVersion.sol"
     flattened_source = compiler.flatten_contract(path, project=project)
-    flattened_source_path = base_expected / "ImportingLessConstrainedVersionFlat.sol"
-
     actual = str(flattened_source)
-    expected = str(flattened_source_path.read_text(encoding="utf8"))
-    assert actual == expected
+    assert actual == EXPECTED_FLATTENED_SOURCE
 
 
 def test_compile_code(project, compiler):
@@ -22,6 +22,20 @@ def solc_error():
     )
 
 
+@pytest.fixture
+def debug_logger():
+    """
+    Sets the logger to DEBUG and restores the previous level,
+    even if the test fails.
+    """
+    level = logger.level
+    logger.set_level("DEBUG")
+    try:
+        yield logger
+    finally:
+        logger.set_level(level)
+
+
 def test_solc_compile_error(solc_error):
     error = SolcCompileError(solc_error)
     actual = str(error)
@@ -32,8 +46,7 @@ def test_solc_compile_error(solc_error):
     assert STDERR_DATA not in actual
 
 
-def test_solc_compile_error_verbose(solc_error):
-    logger.set_level("DEBUG")
+def test_solc_compile_error_verbose(solc_error, debug_logger):
     error = SolcCompileError(solc_error)
     actual = str(error)
     assert MESSAGE in actual
@@ -41,4 +54,3 @@ def test_solc_compile_error_verbose(solc_error):
     assert " ".join(COMMAND) in actual
     assert STDOUT_DATA in actual
     assert STDERR_DATA in actual
-    logger.set_level("INFO")